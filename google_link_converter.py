@@ -4,140 +4,165 @@ Google Link Converter - Demonstration Script
 Converts Google Slides, Drive, Docs, and Sheets sharing links to direct download/analysis URLs
 """
 
+import functools
 import re
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, NamedTuple, Optional, Tuple
 
-def convert_google_links_to_direct_urls(url: str) -> Dict[str, Any]:
+# Path literal preceding the file id for each link type, in priority order
+# (slides, drive, docs, sheets). Located with str.find and followed by an
+# anchored id match instead of a regex search per type.
+_LINK_PREFIXES = (
+    ("https://docs.google.com/presentation/d/", "google_slides"),
+    ("https://drive.google.com/file/d/", "google_drive"),
+    ("https://docs.google.com/document/d/", "google_docs"),
+    ("https://docs.google.com/spreadsheets/d/", "google_sheets"),
+)
+_ID_RE = re.compile(r'[a-zA-Z0-9-_]+')
+
+# Literal shared by every supported host (docs.google.com, drive.google.com)
+_GOOGLE_HOST_MARKER = ".google.com/"
+
+# Analysis URLs offered per file type: (format, URL template, description)
+_EXPORTS = {
+    "google_slides": (
+        ("pdf", "https://docs.google.com/presentation/d/{id}/export/pdf",
+         "PDF version for presentation analysis"),
+        ("pptx", "https://docs.google.com/presentation/d/{id}/export/pptx",
+         "PowerPoint version for download"),
+    ),
+    "google_drive": (
+        ("direct_download", "https://drive.google.com/u/0/uc?id={id}&export=download",
+         "Direct download link for the file"),
+    ),
+    "google_docs": (
+        ("pdf", "https://docs.google.com/document/d/{id}/export?format=pdf",
+         "PDF version for document analysis"),
+        ("docx", "https://docs.google.com/document/d/{id}/export?format=docx",
+         "Word document version"),
+    ),
+    "google_sheets": (
+        ("pdf", "https://docs.google.com/spreadsheets/d/{id}/export?format=pdf",
+         "PDF version for analysis"),
+        ("xlsx", "https://docs.google.com/spreadsheets/d/{id}/export?format=xlsx",
+         "Excel version for download"),
+    ),
+}
+
+_UNRECOGNIZED_ERROR = "URL format not recognized as a Google file sharing link"
+
+# Distinct URLs whose parse results are kept
+_PARSE_CACHE_SIZE = 1024
+
+class GoogleLink(NamedTuple):
+    """Parsed Google sharing link; a fixed-layout tuple instead of nested dicts"""
+    original_url: str
+    file_type: str
+    file_id: Optional[str] = None
+    # (format, url, description) per available analysis URL
+    analysis_urls: Tuple[Tuple[str, str, str], ...] = ()
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the dict shape returned by convert_google_links_to_direct_urls"""
+        results = {
+            "original_url": self.original_url,
+            "analysis_urls": [
+                {"format": fmt, "url": url, "description": description}
+                for fmt, url, description in self.analysis_urls
+            ],
+            "file_type": self.file_type,
+        }
+        if self.error is not None:
+            results["error"] = self.error
+        else:
+            results["file_id"] = self.file_id
+        return results
+
+def _find_file_id(url: str) -> Optional[Tuple[str, str]]:
     """
-    Convert Google Slides and Google Drive sharing links to direct download URLs
+    Return (file type, file id) for a Google sharing link, or None
+    
+    Each type is searched in full before the next one, so a URL holding several
+    links resolves by type priority, not position; an occurrence with an empty
+    id is skipped in favour of a later one of the same type.
+    """
+    for prefix, file_type in _LINK_PREFIXES:
+        start = url.find(prefix)
+        while start >= 0:
+            match = _ID_RE.match(url, start + len(prefix))
+            if match:
+                return file_type, match.group()
+            start = url.find(prefix, start + 1)
+    return None
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def parse_google_link(url: str) -> GoogleLink:
+    """
+    Parse a Google Slides, Drive, Docs, or Sheets sharing link
+    
+    Memoized: the result is an immutable tuple, so repeat URLs share one parse.
+    convert_google_links_to_direct_urls still builds a fresh dict per call, so
+    callers can never mutate a cached result.
     
     Args:
         url: Original Google sharing URL
         
     Returns:
-        Dict containing various format URLs for analysis
+        GoogleLink with the file type, file id and analysis URLs
     """
-    results = {"original_url": url, "analysis_urls": []}
-    
-    # Google Slides link patterns
-    slides_pattern = r'https://docs\.google\.com/presentation/d/([a-zA-Z0-9-_]+)'
-    slides_match = re.search(slides_pattern, url)
-    
-    if slides_match:
-        file_id = slides_match.group(1)
-        results["file_type"] = "google_slides"
-        results["file_id"] = file_id
-        
-        # Create different export URLs
-        results["analysis_urls"] = [
-            {
-                "format": "pdf",
-                "url": f"https://docs.google.com/presentation/d/{file_id}/export/pdf",
-                "description": "PDF version for presentation analysis"
-            },
-            {
-                "format": "pptx", 
-                "url": f"https://docs.google.com/presentation/d/{file_id}/export/pptx",
-                "description": "PowerPoint version for download"
-            }
-        ]
-        return results
-    
-    # Google Drive file link patterns
-    drive_pattern = r'https://drive\.google\.com/file/d/([a-zA-Z0-9-_]+)'
-    drive_match = re.search(drive_pattern, url)
-    
-    if drive_match:
-        file_id = drive_match.group(1)
-        results["file_type"] = "google_drive"
-        results["file_id"] = file_id
-        
-        # Create direct download URL
-        results["analysis_urls"] = [
-            {
-                "format": "direct_download",
-                "url": f"https://drive.google.com/u/0/uc?id={file_id}&export=download",
-                "description": "Direct download link for the file"
-            }
-        ]
-        return results
+    # Cheap literal check first; non-Google URLs never reach the lookup
+    found = _find_file_id(url) if _GOOGLE_HOST_MARKER in url else None
     
-    # Google Docs link patterns
-    docs_pattern = r'https://docs\.google\.com/document/d/([a-zA-Z0-9-_]+)'
-    docs_match = re.search(docs_pattern, url)
-    
-    if docs_match:
-        file_id = docs_match.group(1)
-        results["file_type"] = "google_docs"
-        results["file_id"] = file_id
-        
-        # Create export URLs
-        results["analysis_urls"] = [
-            {
-                "format": "pdf",
-                "url": f"https://docs.google.com/document/d/{file_id}/export?format=pdf",
-                "description": "PDF version for document analysis"
-            },
-            {
-                "format": "docx",
-                "url": f"https://docs.google.com/document/d/{file_id}/export?format=docx", 
-                "description": "Word document version"
-            }
-        ]
-        return results
-    
-    # Google Sheets link patterns  
-    sheets_pattern = r'https://docs\.google\.com/spreadsheets/d/([a-zA-Z0-9-_]+)'
-    sheets_match = re.search(sheets_pattern, url)
+    # If no pattern matches
+    if found is None:
+        return GoogleLink(url, "unknown", error=_UNRECOGNIZED_ERROR)
+    
+    file_type, file_id = found
+    analysis_urls = tuple(
+        (fmt, template.format(id=file_id), description)
+        for fmt, template, description in _EXPORTS[file_type]
+    )
+    return GoogleLink(url, file_type, file_id, analysis_urls)
+
+def convert_google_links_to_direct_urls(url: str) -> Dict[str, Any]:
+    """
+    Convert Google Slides and Google Drive sharing links to direct download URLs
     
-    if sheets_match:
-        file_id = sheets_match.group(1)
-        results["file_type"] = "google_sheets"
-        results["file_id"] = file_id
-        
-        # Create export URLs
-        results["analysis_urls"] = [
-            {
-                "format": "pdf",
-                "url": f"https://docs.google.com/spreadsheets/d/{file_id}/export?format=pdf",
-                "description": "PDF version for analysis"
-            },
-            {
-                "format": "xlsx",
-                "url": f"https://docs.google.com/spreadsheets/d/{file_id}/export?format=xlsx",
-                "description": "Excel version for download"
-            }
-        ]
-        return results
+    Args:
+        url: Original Google sharing URL
         
-    # If no pattern matches
-    results["file_type"] = "unknown"
-    results["error"] = "URL format not recognized as a Google file sharing link"
-    return results
+    Returns:
+        Dict containing various format URLs for analysis
+    """
+    return parse_google_link(url).to_dict()
 
 def display_conversion_results(url: str):
     """Display conversion results in a formatted way"""
-    print("=" * 80)
-    print("🔄 GOOGLE LINK CONVERTER - DEMONSTRATION")
-    print("=" * 80)
-    
-    results = convert_google_links_to_direct_urls(url)
-    
-    print(f"\n📁 **Original URL:** {results['original_url']}")
-    
-    if "error" in results:
-        print(f"❌ **Error:** {results['error']}")
-        return
-    
-    print(f"📋 **File Type:** {results['file_type'].replace('_', ' ').title()}")
-    print(f"🔗 **File ID:** {results['file_id']}")
+    link = parse_google_link(url)
+    
+    # Collect all lines and write them in one call instead of one print() per line
+    lines = [
+        "=" * 80,
+        "🔄 GOOGLE LINK CONVERTER - DEMONSTRATION",
+        "=" * 80,
+        f"\n📁 **Original URL:** {link.original_url}",
+    ]
     
-    print(f"\n📎 **Available Analysis URLs:**")
-    for i, url_info in enumerate(results['analysis_urls'], 1):
-        print(f"{i}. **{url_info['format'].upper()}:**")
-        print(f"   URL: {url_info['url']}")
-        print(f"   Use: {url_info['description']}")
-        print()
+    if link.error is not None:
+        lines.append(f"❌ **Error:** {link.error}")
+    else:
+        lines.append(f"📋 **File Type:** {link.file_type.replace('_', ' ').title()}")
+        lines.append(f"🔗 **File ID:** {link.file_id}")
+        
+        lines.append(f"\n📎 **Available Analysis URLs:**")
+        for i, (fmt, analysis_url, description) in enumerate(link.analysis_urls, 1):
+            lines.append(f"{i}. **{fmt.upper()}:**")
+            lines.append(f"   URL: {analysis_url}")
+            lines.append(f"   Use: {description}")
+            lines.append("")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     # Test with the provided URLs
@@ -6,76 +6,695 @@ Provides tools for analyzing graphic design images using OpenAI's vision model
 
 import asyncio
 import os
+import sys
 import base64
 import requests
 import io
 import time
 import random
-from typing import Any, Dict, List, Tuple, Optional
-from openai import OpenAI
-from fastmcp import FastMCP
-from datetime import datetime
+import functools
+import hashlib
+import json
+import tempfile
+import contextlib
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib3.util.retry import Retry
+from openai import AsyncOpenAI, BadRequestError
+from fastmcp import FastMCP, Context
+
+@contextlib.asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[dict]:
+    """Shut down the screenshot browser and its Playwright driver when the server stops"""
+    try:
+        yield {}
+    finally:
+        await _close_browser()
 
 # Initialize FastMCP server
-mcp = FastMCP("Graphic Design MCP")
+mcp = FastMCP("Graphic Design MCP", lifespan=_lifespan)
+
+def _clean_url(url: str) -> str:
+    """Trim whitespace and a leading '@' (as pasted from chat mentions) from a URL"""
+    url = (url or '').strip()
+    if url[:1] == '@':
+        url = url.lstrip('@').lstrip()
+    return url
+
+_URL_SCHEMES = ('http://', 'https://')
+
+def _validate_url(url: str) -> Tuple[str, Optional[str]]:
+    """Clean a tool's URL argument; return (url, error message or None)"""
+    url = _clean_url(url)
+    if not url:
+        return url, "❌ Error: URL cannot be empty"
+    if not url.startswith(_URL_SCHEMES):
+        return url, "❌ Error: Please provide a valid HTTP/HTTPS URL"
+    return url, None
+
+@functools.lru_cache(maxsize=1)
+def _get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """Return a shared AsyncOpenAI client so its connection pool is reused across tool calls"""
+    return AsyncOpenAI(api_key=api_key)
+
+# Read once at import; the MCP client sets the server's environment at launch
+_API_KEY = os.getenv("OPENAI_API_KEY")
+
+_MISSING_KEY_ERROR = "❌ Error: OPENAI_API_KEY environment variable not found. Please set your OpenAI API key."
+
+def _get_client() -> Optional[AsyncOpenAI]:
+    """Return the shared client for OPENAI_API_KEY, or None when the key is not set"""
+    return _get_async_openai_client(_API_KEY) if _API_KEY else None
+
+# Async client whose connection to api.openai.com has been warmed up, and the
+# background warm-up task (referenced so it is not garbage-collected mid-flight)
+_warmed_client: Optional[AsyncOpenAI] = None
+_warm_up_task: Optional["asyncio.Future[None]"] = None
+
+async def _warm_up_client(client: AsyncOpenAI) -> None:
+    """Open the client's connection to api.openai.com with a small model lookup; errors are ignored"""
+    try:
+        await client.models.retrieve("gpt-4o")
+    except Exception:
+        pass
 
-@mcp.tool()
-def analyze_design(url: str) -> str:
+def _start_warm_up(client: AsyncOpenAI) -> None:
     """
-    Analyze graphic design and provide detailed feedback on visual elements.
+    Warm up the client's connection in the background, once per client.
     
-    This tool downloads an image from the provided URL and analyzes it using OpenAI's vision model.
-    It provides scores and feedback on Visual Harmony, Clarity, User Friendliness, Interactivity, and Creativity.
+    Started alongside the image probe so the first completion usually finds DNS
+    and the TLS handshake done. It is never awaited: no call waits on it, and a
+    first call answered from the cache costs only an idle connection.
+    """
+    global _warmed_client, _warm_up_task
+    if _warmed_client is client:
+        return
+    _warmed_client = client
+    _warm_up_task = asyncio.ensure_future(_warm_up_client(client))
+
+# Shared HTTP session so repeated downloads from the same host reuse TCP/TLS connections.
+# Downloads run on the default executor (up to 32 threads), so each host pool keeps
+# that many connections instead of discarding the extras under concurrent calls.
+_SESSION = requests.Session()
+
+# Longest wait honored from a Retry-After header; the wait blocks an executor thread
+_MAX_RETRY_WAIT = 10
+
+class _BoundedRetry(Retry):
+    """Retry that caps Retry-After waits at _MAX_RETRY_WAIT seconds"""
     
-    Args:
-        url: The URL of the image to analyze (must be a valid HTTP/HTTPS URL)
-        
-    Returns:
-        A detailed analysis of the graphic design with scores and recommendations
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, _MAX_RETRY_WAIT)
+
+# Transient image host failures (rate limits, gateway errors) are retried twice,
+# immediately and then after 1s (urllib3 skips the backoff before the first retry),
+# or after the server's Retry-After. Connection errors and read timeouts are not
+# retried, so a stalled host fails after one timeout.
+_DOWNLOAD_RETRY = _BoundedRetry(total=2, connect=0, read=0, backoff_factor=0.5,
+                                status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+for _scheme in ("https://", "http://"):
+    _SESSION.mount(_scheme, requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                                                          max_retries=_DOWNLOAD_RETRY))
+
+# Browser User-Agent sent with every download, set once on the session
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Pooled session for the PDF access strategies. A blocked strategy should fail
+# fast so the next one is tried, so nothing is retried here (only the final
+# fallback on _SESSION retries), and cookies are neither stored nor sent, so one
+# host's bot-protection state never follows later tool calls.
+_STRATEGY_SESSION = requests.Session()
+_STRATEGY_SESSION.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+for _scheme in ("https://", "http://"):
+    _STRATEGY_SESSION.mount(_scheme, requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                                                                   max_retries=Retry(total=0)))
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Images above this size are downscaled locally instead of being sent as-is
+_MAX_IMAGE_BYTES = 4 * 1024 * 1024
+# Longest side GPT-4o actually processes; larger images are resized server-side anyway
+_MAX_IMAGE_SIDE = 1568
+# Images above this size are refused instead of being buffered for downscaling
+_MAX_DOWNLOAD_BYTES = 20 * 1024 * 1024
+_TOO_LARGE_ERROR = f"Image is larger than {_MAX_DOWNLOAD_BYTES // (1024 * 1024)} MB"
+
+# Leading bytes of the image formats GPT-4o accepts (WebP is checked separately)
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+def _sniff_image_type(head: bytes) -> Optional[str]:
+    """Return the image MIME type named by a file's magic bytes, or None"""
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    for signature, mime in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return mime
+    return None
+
+def _probe_image(url: str) -> Optional[Tuple[str, int, Optional[str]]]:
+    """
+    Send a HEAD request and return (mime type, content length, validator).
+    
+    The validator is the ETag or Last-Modified header, when the server sends one.
+    
+    Returns None when the server does not answer HEAD usefully; callers then
+    fall back to the regular download checks.
     """
     try:
-        # Validate and clean URL
-        if not url or not url.strip():
-            return "❌ Error: URL cannot be empty"
-        
-        url = url.strip().lstrip('@')
-        
-        if not url.startswith(('http://', 'https://')):
-            return "❌ Error: Please provide a valid HTTP/HTTPS URL"
-        
-        # Get OpenAI API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return "❌ Error: OPENAI_API_KEY environment variable not found. Please set your OpenAI API key."
-        
-        # Download image with proper headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _SESSION.head(url, timeout=10, allow_redirects=True)
+    except requests.exceptions.RequestException:
+        return None
+    if not response.ok:
+        return None
+    
+    mime = response.headers.get('content-type', '').split(';')[0].strip().lower()
+    if not mime:
+        return None
+    try:
+        size = int(response.headers.get('content-length', 0))
+    except ValueError:
+        size = 0
+    validator = response.headers.get('etag') or response.headers.get('last-modified')
+    return mime, size, validator
+
+def _shrink_image(mime: str, image_bytes: bytes) -> Tuple[str, bytes]:
+    """
+    Downscale an image to _MAX_IMAGE_SIDE and re-encode it as JPEG, with any
+    transparency flattened onto white.
+    
+    Images already within _MAX_IMAGE_SIDE and _MAX_IMAGE_BYTES are returned as-is;
+    Image.open only reads the header, so that check costs no decode.
+    """
+    # Imported on first use; only the inline fallback needs Pillow, so server startup skips it
+    from PIL import Image
+    
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            if max(img.size) <= _MAX_IMAGE_SIDE and len(image_bytes) <= _MAX_IMAGE_BYTES:
+                return mime, image_bytes
+            img.thumbnail((_MAX_IMAGE_SIDE, _MAX_IMAGE_SIDE))
+            if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info:
+                # JPEG has no alpha channel; flatten onto white so transparent
+                # logos and mockups don't reach the model on a black background
+                rgba = img.convert('RGBA')
+                flat = Image.new('RGB', rgba.size, (255, 255, 255))
+                flat.paste(rgba, mask=rgba)
+            else:
+                flat = img.convert('RGB')
+            output = io.BytesIO()
+            flat.save(output, 'JPEG', quality=85)
+    except OSError:
+        # Pillow cannot decode it (e.g. SVG); send the original bytes
+        return mime, image_bytes
+    return 'image/jpeg', output.getvalue()
+
+# Input bytes per base64 step; a multiple of 3 so only the last step is padded
+_BASE64_CHUNK_SIZE = 3 * 16 * 1024
+
+def _to_data_url(mime: str, image_bytes: bytes) -> str:
+    """
+    Encode an image as a base64 data URL labelled with its real MIME type.
+    
+    The image is encoded in chunks into one buffer preallocated for the whole
+    URL, so the only full-size copies are that buffer and the final str.
+    """
+    prefix = f"data:{mime};base64,".encode('ascii')
+    view = memoryview(image_bytes)
+    url = bytearray(len(prefix) + 4 * ((len(view) + 2) // 3))
+    url[:len(prefix)] = prefix
+    offset = len(prefix)
+    for start in range(0, len(view), _BASE64_CHUNK_SIZE):
+        encoded = base64.b64encode(view[start:start + _BASE64_CHUNK_SIZE])
+        url[offset:offset + len(encoded)] = encoded
+        offset += len(encoded)
+    return url.decode('ascii')
+
+# Upper bound on PDF pages rendered for analysis, and their resolution (a 16:9 slide is ~1000x560)
+_MAX_PDF_PAGES = 10
+_PDF_RENDER_DPI = 100
+
+def _sample_pdf_pages(total_pages: int) -> List[int]:
+    """Pick up to _MAX_PDF_PAGES page indexes spread evenly from the first to the last page"""
+    if total_pages <= _MAX_PDF_PAGES:
+        return list(range(total_pages))
+    step = (total_pages - 1) / (_MAX_PDF_PAGES - 1)
+    return [round(i * step) for i in range(_MAX_PDF_PAGES)]
+
+def _count_pdf_pages(pdf_bytes: bytes) -> int:
+    """
+    Return a PDF's page count, or 0 when PyMuPDF is not installed or cannot open it.
+    
+    Opening a document only parses its cross-reference table, so this is cheap
+    next to rendering; it lets the page sample (and the cache key) be known
+    before any page is drawn.
+    """
+    try:
+        import fitz
+    except ImportError:
+        return 0
+    
+    try:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            return len(doc)
+    except Exception:
+        # Damaged or encrypted PDF; fall back to the text-only analysis
+        return 0
+
+def _render_pdf_pages(pdf_bytes: bytes, page_indexes: Sequence[int]) -> Optional[List[str]]:
+    """
+    Render the given PDF pages (see _sample_pdf_pages) as JPEG data URLs.
+    
+    Long decks are reviewed from the cover, the closing page and evenly spaced
+    pages in between instead of only their opening pages, and rendering cost
+    stays bounded by _MAX_PDF_PAGES however long the file is.
+    
+    Returns the data URLs in page order, or None when a page cannot be rendered.
+    """
+    import fitz
+    from PIL import Image
+    
+    try:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            page_urls = []
+            for index in page_indexes:
+                pixmap = doc[index].get_pixmap(dpi=_PDF_RENDER_DPI, alpha=False)
+                img = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+                output = io.BytesIO()
+                img.save(output, 'JPEG', quality=85)
+                page_urls.append(_to_data_url('image/jpeg', output.getvalue()))
+    except Exception:
+        return None
+    return page_urls or None
+
+# Streamed chunks (roughly tokens) between progress notifications
+_PROGRESS_INTERVAL = 25
+
+class _TokenProgress:
+    """
+    Counts streamed chunks across one analysis' completions and reports them as MCP progress.
+    
+    Every ctx in ctxs is notified, so callers sharing an in-flight analysis each get
+    progress. Progress is best-effort: a ctx whose session has gone away is dropped
+    instead of failing the analysis.
+    """
+    
+    def __init__(self, ctx: Optional[Context], total: int):
+        self.ctxs: List[Context] = [] if ctx is None else [ctx]
+        self.total = total
+        self.received = 0
+    
+    async def advance(self) -> None:
+        self.received += 1
+        if self.received % _PROGRESS_INTERVAL:
+            return
+        for ctx in list(self.ctxs):
+            try:
+                await ctx.report_progress(self.received, self.total)
+            except Exception:
+                if ctx in self.ctxs:
+                    self.ctxs.remove(ctx)
+
+async def _stream_completion(client: AsyncOpenAI, content, max_tokens: int, temperature: float,
+                             progress: _TokenProgress) -> str:
+    """
+    Run a streamed GPT-4o completion for one user message and return its text.
+    
+    Streaming lets the tool report progress from the first token instead of
+    sitting silent until the whole answer is generated.
+    """
+    result = await client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "user", 
+                "content": content
+            }
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        stream=True
+    )
+    parts = []
+    async for chunk in result:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            await progress.advance()
+    return "".join(parts)
+
+# Recent analyses, most recently used last, keyed by _cache_key() digests
+_ANALYSIS_CACHE_SIZE = 64
+_analysis_cache = OrderedDict()
+
+# Analyses are also persisted to disk so they survive server restarts.
+# Set GRAPHIC_DESIGN_MCP_CACHE_DIR to an empty string to disable the disk cache.
+_CACHE_DIR = os.path.expanduser(
+    os.getenv("GRAPHIC_DESIGN_MCP_CACHE_DIR", os.path.join("~", ".cache", "graphic-design-mcp"))
+)
+_CACHE_TTL = 7 * 24 * 60 * 60
+
+def _cache_key(prompt: str, *parts: bytes) -> str:
+    """Digest identifying an analysis: the prompt plus the image URL/validator or content"""
+    digest = hashlib.blake2b(prompt.encode(), digest_size=16)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+def _remember_analysis(key: str, analysis: str) -> None:
+    """Store an analysis in memory, evicting the least recently used entry when full"""
+    _analysis_cache[key] = analysis
+    _analysis_cache.move_to_end(key)
+    if len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+def _remove_file(path: str) -> None:
+    """Delete a cache file, ignoring one that is already gone or locked"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+def _read_cache_file(key: str) -> Optional[str]:
+    """Load an unexpired analysis from the disk cache; expired or malformed entries are deleted"""
+    if not _CACHE_DIR:
+        return None
+    path = os.path.join(_CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+    except OSError:
+        return None
+    except ValueError:
+        _remove_file(path)
+        return None
+    
+    # Anything but {"created": <number>, "analysis": <str>} is treated as a miss
+    created = entry.get("created") if isinstance(entry, dict) else None
+    analysis = entry.get("analysis") if isinstance(entry, dict) else None
+    if (not isinstance(created, (int, float)) or isinstance(created, bool)
+            or not isinstance(analysis, str) or time.time() - created > _CACHE_TTL):
+        _remove_file(path)
+        return None
+    return analysis
+
+# Whether this process has swept expired files out of the cache directory
+_cache_pruned = False
+
+def _prune_cache_dir() -> None:
+    """Delete cache entries, and temp files left by failed writes, older than _CACHE_TTL"""
+    cutoff = time.time() - _CACHE_TTL
+    try:
+        with os.scandir(_CACHE_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(('.json', '.tmp')):
+                    continue
+                try:
+                    expired = entry.stat().st_mtime < cutoff
+                except OSError:
+                    continue
+                if expired:
+                    _remove_file(entry.path)
+    except OSError:
+        pass
+
+def _write_cache_file(key: str, analysis: str) -> None:
+    """Persist an analysis atomically; failures only cost the disk cache"""
+    global _cache_pruned
+    if not _CACHE_DIR:
+        return
+    tmp_path = None
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"created": time.time(), "analysis": analysis}, f)
+        os.replace(tmp_path, os.path.join(_CACHE_DIR, f"{key}.json"))
+    except (OSError, ValueError):
+        if tmp_path is not None:
+            _remove_file(tmp_path)
+    
+    # Entries that are never read again would otherwise stay forever; sweep
+    # them on the first write of each process
+    if not _cache_pruned:
+        _cache_pruned = True
+        _prune_cache_dir()
+
+async def _get_cached_analysis(key: str) -> Optional[str]:
+    """Return a cached analysis from memory or disk and mark it as recently used"""
+    analysis = _analysis_cache.get(key)
+    if analysis is not None:
+        _analysis_cache.move_to_end(key)
+        return analysis
+    
+    loop = asyncio.get_running_loop()
+    analysis = await loop.run_in_executor(None, _read_cache_file, key)
+    if analysis is not None:
+        _remember_analysis(key, analysis)
+    return analysis
+
+async def _cache_analysis(key: str, analysis: str) -> None:
+    """Store an analysis in memory and on disk"""
+    _remember_analysis(key, analysis)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _write_cache_file, key, analysis)
+
+def _download_image(url: str) -> Optional[Tuple[str, bytearray]]:
+    """
+    Stream an image into a buffer preallocated from Content-Length.
+    
+    The MIME type comes from the file's magic bytes when they are recognized,
+    so images served as application/octet-stream or text/html by misconfigured
+    hosts are accepted and correctly labelled.
+    
+    Returns (mime type, image bytes), or None after reading only the first chunk
+    when the response is not an image. Raises ValueError once the image exceeds
+    _MAX_DOWNLOAD_BYTES, so an unbounded body is never buffered.
+    """
+    with _SESSION.get(url, timeout=30, stream=True) as response:
         response.raise_for_status()
         
-        # Check if the content is an image
-        content_type = response.headers.get('content-type', '')
-        if not content_type.startswith('image/'):
-            return "❌ Error: The provided URL does not point to an image file"
-        
-        # Encode image to base64
-        image_data = base64.b64encode(response.content).decode()
-        
-        # Create OpenAI client and analyze
-        client = OpenAI(api_key=api_key)
-        
-        result = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user", 
-                    "content": [
-                        {
-                            "type": "text", 
-                            "text": """Analyze this graphic design in detail. Please provide ONLY numerical scores (1-10) for each category, then detailed feedback:
+        # Check if the content is an image, from the bytes when the header disagrees
+        mime = response.headers.get('content-type', '').split(';')[0].strip().lower()
+        chunks = response.iter_content(_DOWNLOAD_CHUNK_SIZE)
+        first = b''
+        if not mime.startswith('image/'):
+            first = next(chunks, b'')
+            mime = _sniff_image_type(first[:12])
+            if mime is None:
+                return None
+        
+        # Content-Length is only a sizing hint (it is the encoded size for gzip bodies)
+        try:
+            expected = int(response.headers.get('content-length', 0))
+        except ValueError:
+            expected = 0
+        if expected > _MAX_DOWNLOAD_BYTES:
+            raise ValueError(_TOO_LARGE_ERROR)
+        buffer = bytearray(expected)
+        buffer[:len(first)] = first
+        offset = len(first)
+        for chunk in chunks:
+            buffer[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+            if offset > _MAX_DOWNLOAD_BYTES:
+                raise ValueError(_TOO_LARGE_ERROR)
+        del buffer[offset:]
+        # The bytes also win over a wrong image/* label, e.g. image/jpg for a PNG
+        return _sniff_image_type(buffer[:12]) or mime, buffer
+
+# Shared headless Chromium for website screenshots, launched on first use, and
+# the Playwright driver process that controls it
+_browser = None
+_playwright = None
+_browser_lock: Optional[asyncio.Lock] = None
+_screenshots_unavailable = False
+_SCREENSHOT_VIEWPORT = {"width": 1280, "height": 800}
+
+async def _get_browser():
+    """
+    Return the shared Chromium browser, launching it on first use.
+    
+    Playwright is optional; returns None when it is not installed or Chromium
+    cannot be started (run `playwright install chromium`), and does not retry.
+    """
+    global _browser, _browser_lock, _playwright, _screenshots_unavailable
+    if _screenshots_unavailable:
+        return None
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            # Stop the driver of a crashed browser before starting a new one
+            await _close_browser()
+            try:
+                from playwright.async_api import async_playwright
+                _playwright = await async_playwright().start()
+            except Exception:
+                _screenshots_unavailable = True
+                return None
+            try:
+                _browser = await _playwright.chromium.launch(headless=True)
+            except Exception:
+                await _close_browser()
+                _screenshots_unavailable = True
+                return None
+    return _browser
+
+async def _close_browser() -> None:
+    """Close the shared browser and stop its Playwright driver; errors are ignored"""
+    global _browser, _playwright
+    browser, playwright = _browser, _playwright
+    _browser = _playwright = None
+    if browser is not None:
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    if playwright is not None:
+        try:
+            await playwright.stop()
+        except Exception:
+            pass
+
+async def _screenshot_website(url: str) -> Optional[bytes]:
+    """Capture the first viewport of a web page as JPEG, or None when screenshots are unavailable"""
+    browser = await _get_browser()
+    if browser is None:
+        return None
+    page = await browser.new_page(viewport=_SCREENSHOT_VIEWPORT)
+    try:
+        await page.goto(url, wait_until="load", timeout=15000)
+        return await page.screenshot(type="jpeg", quality=80)
+    finally:
+        await page.close()
+
+class _ImageJob(NamedTuple):
+    """One analysis of an image: the prompt, its completion settings and report template"""
+    prompt: str
+    max_tokens: int
+    temperature: float
+    # Template filled with {analysis} and {url}
+    report: str
+
+async def _analyze_image(client: AsyncOpenAI, url: str, jobs: Sequence[_ImageJob],
+                         progress: _TokenProgress) -> Optional[List[str]]:
+    """
+    Run a GPT-4o vision completion per job for the image at url.
+    
+    A HEAD probe rejects files declared larger than _MAX_DOWNLOAD_BYTES (ValueError)
+    before anything is fetched. When it reports an image type (or nothing), the URL
+    is handed to OpenAI to fetch directly, which skips the local download and the
+    base64 upload. If OpenAI cannot fetch it (private or bot-protected hosts), the
+    image is larger than _MAX_IMAGE_BYTES, or the host labels it with another type
+    (the download then decides from the magic bytes), the image is downloaded, downscaled when larger
+    than _MAX_IMAGE_SIDE or _MAX_IMAGE_BYTES, and sent inline as a data URL instead.
+    The probe, download and encoding happen once however many jobs there are, and
+    the jobs' completions run concurrently.
+    
+    Results are cached in memory and on disk by image content, or by URL plus
+    ETag/Last-Modified when OpenAI fetched the image itself, so repeated reviews
+    skip the model call.
+    
+    Blocking requests and resizing run in the default executor so the event loop
+    stays free for other tool calls. The completions are streamed and reported
+    through progress (tokens received out of all jobs' max_tokens).
+    
+    Returns the analyses in job order, or None when the URL does not point to an image.
+    """
+    
+    async def _complete(image_url: str, job: _ImageJob) -> str:
+        content = [
+            {"type": "text", "text": job.prompt},
+            {"type": "image_url", "image_url": {"url": image_url}}
+        ]
+        return await _stream_completion(client, content, job.max_tokens, job.temperature, progress)
+    
+    loop = asyncio.get_running_loop()
+    
+    # Check type and size from the headers before anything is transferred, while
+    # the OpenAI connection is opened in the background
+    _start_warm_up(client)
+    probe = await loop.run_in_executor(None, _probe_image, url)
+    mime, size, validator = probe if probe is not None else ('', 0, None)
+    if size > _MAX_DOWNLOAD_BYTES:
+        raise ValueError(_TOO_LARGE_ERROR)
+    
+    analyses: List[Optional[str]] = [None] * len(jobs)
+    
+    # Without a validator a changed image could hide behind the same URL, so don't cache
+    url_keys = [
+        _cache_key(job.prompt, url.encode(), validator.encode()) if validator else None
+        for job in jobs
+    ]
+    for i, url_key in enumerate(url_keys):
+        if url_key is not None:
+            analyses[i] = await _get_cached_analysis(url_key)
+    pending = [i for i, analysis in enumerate(analyses) if analysis is None]
+    if not pending:
+        return analyses
+    
+    # OpenAI trusts the host's Content-Type, so only labelled images are fetched by URL;
+    # anything else goes to _download_image, which checks the first chunk's magic bytes
+    if size <= _MAX_IMAGE_BYTES and (not mime or mime.startswith('image/')):
+        async def _complete_by_url(i: int) -> None:
+            analyses[i] = await _complete(url, jobs[i])
+            if url_keys[i] is not None:
+                await _cache_analysis(url_keys[i], analyses[i])
+        
+        results = await asyncio.gather(*(_complete_by_url(i) for i in pending), return_exceptions=True)
+        for result in results:
+            # BadRequestError means OpenAI could not fetch the URL; anything else is real
+            if isinstance(result, BaseException) and not isinstance(result, BadRequestError):
+                raise result
+        pending = [i for i in pending if analyses[i] is None]
+        if not pending:
+            return analyses
+    
+    # Fall back to downloading the image ourselves
+    download = await loop.run_in_executor(None, _download_image, url)
+    if download is None:
+        return None
+    # Unpack without keeping the tuple, so only image_bytes holds the body
+    mime, image_bytes = download
+    del download
+    
+    content_keys = {i: _cache_key(jobs[i].prompt, image_bytes) for i in pending}
+    for i in pending:
+        analyses[i] = await _get_cached_analysis(content_keys[i])
+    missing = [i for i in pending if analyses[i] is None]
+    if missing:
+        # Downscale high-resolution images even when small in bytes; GPT-4o would
+        # resize them server-side anyway, after we paid to upload them
+        mime, image_bytes = await loop.run_in_executor(None, _shrink_image, mime, image_bytes)
+        
+        # Encode off the event loop and drop the raw bytes, so only the data URL
+        # stays alive while the completions stream
+        data_url = await loop.run_in_executor(None, _to_data_url, mime, image_bytes)
+        del image_bytes
+        
+        async def _complete_inline(i: int) -> None:
+            analyses[i] = await _complete(data_url, jobs[i])
+            await _cache_analysis(content_keys[i], analyses[i])
+        
+        await asyncio.gather(*(_complete_inline(i) for i in missing))
+        del data_url
+    
+    for i in pending:
+        if url_keys[i] is not None:
+            await _cache_analysis(url_keys[i], analyses[i])
+    return analyses
+
+# Prompts for the image analysis tools
+_DESIGN_PROMPT = """Analyze this graphic design in detail. Please provide ONLY numerical scores (1-10) for each category, then detailed feedback:
 
 SCORES (format: "Category: X/10"):
 1. Visual Harmony: X/10
@@ -85,96 +704,8 @@ SCORES (format: "Category: X/10"):
 5. Creativity: X/10
 
 Then provide detailed feedback for each category and overall recommendations."""
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
-                        }
-                    ]
-                }
-            ],
-            max_tokens=1200,
-            temperature=0.7
-        )
-        
-        analysis = result.choices[0].message.content
-        
-        # Format the response with emojis and better structure
-        formatted_response = f"""
-🎨 **GRAPHIC DESIGN ANALYSIS REPORT**
 
-📋 **ANALYSIS RESULTS:**
-{analysis}
-
-🔗 **ANALYZED IMAGE:** {url}
-
----
-*✨ Analysis powered by OpenAI GPT-4 Vision*"""
-        
-        return formatted_response
-        
-    except requests.exceptions.RequestException as e:
-        return f"❌ **Network Error:** Could not download image from URL. {str(e)}"
-    except Exception as e:
-        return f"❌ **Error:** {str(e)}"
-
-@mcp.tool()
-def analyze_copywriting(url: str) -> str:
-    """
-    Analyze copywriting in images and provide scoring with alternative suggestions.
-    
-    This tool downloads an image from the provided URL and analyzes any text/copywriting present.
-    It provides scores on effectiveness, clarity, persuasiveness, and offers alternative copywriting suggestions.
-    
-    Args:
-        url: The URL of the image to analyze (must be a valid HTTP/HTTPS URL)
-        
-    Returns:
-        A detailed analysis of the copywriting with scores and alternative suggestions
-    """
-    try:
-        # Validate and clean URL
-        if not url or not url.strip():
-            return "❌ Error: URL cannot be empty"
-        
-        url = url.strip().lstrip('@')
-        
-        if not url.startswith(('http://', 'https://')):
-            return "❌ Error: Please provide a valid HTTP/HTTPS URL"
-        
-        # Get OpenAI API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return "❌ Error: OPENAI_API_KEY environment variable not found. Please set your OpenAI API key."
-        
-        # Download image with proper headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Check if the content is an image
-        content_type = response.headers.get('content-type', '')
-        if not content_type.startswith('image/'):
-            return "❌ Error: The provided URL does not point to an image file"
-        
-        # Encode image to base64
-        image_data = base64.b64encode(response.content).decode()
-        
-        # Create OpenAI client and analyze
-        client = OpenAI(api_key=api_key)
-        
-        result = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user", 
-                    "content": [
-                        {
-                            "type": "text", 
-                            "text": """Analyze the copywriting/text content in this image. Please provide:
+_COPY_PROMPT = """Analyze the copywriting/text content in this image. Please provide:
 
 **1. TEXT EXTRACTION**
 - List all visible text/copywriting in the image
@@ -196,22 +727,133 @@ def analyze_copywriting(url: str) -> str:
 - Tone and voice adjustments
 
 If no text is visible, indicate that no copywriting was found to analyze."""
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
-                        }
-                    ]
-                }
-            ],
-            max_tokens=1500,
-            temperature=0.8
-        )
-        
-        analysis = result.choices[0].message.content
-        
-        # Format the response with emojis and better structure
-        formatted_response = f"""
+
+_LAYOUT_PROMPT = """Analyze this design with a focus on layout, alignment, and spacing issues. Provide detailed feedback on:
+
+**LAYOUT ANALYSIS SCORES** (format: "Category: X/10"):
+1. Overall Alignment: X/10
+2. Spacing Consistency: X/10
+3. Grid System Usage: X/10
+4. Element Balance: X/10
+5. Visual Weight Distribution: X/10
+
+**DETAILED LAYOUT ASSESSMENT:**
+
+**1. ALIGNMENT ISSUES:**
+- Identify misaligned elements (text, images, buttons, etc.)
+- Check for consistent margins and padding
+- Evaluate baseline grid alignment
+- Note any elements that break the layout structure
+
+**2. SPACING PROBLEMS:**
+- Analyze white space usage and distribution
+- Check for inconsistent gaps between elements
+- Identify cramped or overly spaced areas
+- Evaluate breathing room around key elements
+
+**3. SYMMETRY & ASYMMETRY:**
+- Identify intentional vs unintentional asymmetric elements
+- Check for visual balance issues
+- Note elements that appear "off-center" when they shouldn't be
+- Evaluate compositional balance
+
+**4. GRID & STRUCTURE:**
+- Assess adherence to grid system
+- Identify elements that break the grid unnecessarily
+- Check for consistent column widths and gutters
+- Evaluate overall structural hierarchy
+
+**5. SPECIFIC RECOMMENDATIONS:**
+- Provide exact pixel/spacing adjustments where possible
+- Suggest alignment fixes for specific elements
+- Recommend spacing improvements
+- Propose solutions for asymmetry issues
+- Give actionable layout optimization tips
+
+Be very specific about what needs to be fixed and how to fix it."""
+
+_ARCHITECTURE_PROMPT = """Analyze this architectural design in detail. Focus specifically on architectural elements and provide numerical scores (1-10) for each category, then detailed feedback:
+
+**ARCHITECTURAL DESIGN SCORES** (format: "Category: X/10"):
+1. Architectural Composition: X/10
+2. Spatial Design & Flow: X/10
+3. Structural Integrity & Innovation: X/10
+4. Material Selection & Usage: X/10
+5. Environmental Integration: X/10
+6. Functional Design: X/10
+7. Aesthetic Appeal: X/10
+8. Sustainability Considerations: X/10
+
+**DETAILED ARCHITECTURAL ANALYSIS:**
+
+**1. ARCHITECTURAL COMPOSITION:**
+- Proportion and scale relationships
+- Symmetry and balance in design
+- Visual weight distribution
+- Architectural harmony and unity
+
+**2. SPATIAL DESIGN & FLOW:**
+- Interior/exterior space organization
+- Traffic flow and circulation patterns
+- Space efficiency and functionality
+- Relationship between different areas
+
+**3. STRUCTURAL ELEMENTS:**
+- Structural system clarity and logic
+- Innovation in structural solutions
+- Integration of structure with design
+- Structural expression and aesthetics
+
+**4. MATERIAL ANALYSIS:**
+- Material selection appropriateness
+- Texture and color combinations
+- Material durability and maintenance
+- Cost-effectiveness of material choices
+
+**5. ENVIRONMENTAL INTEGRATION:**
+- Site integration and context response
+- Climate-responsive design features
+- Landscape integration
+- Natural light and ventilation utilization
+
+**6. FUNCTIONAL DESIGN:**
+- Program requirements fulfillment
+- User experience and comfort
+- Accessibility considerations
+- Flexibility and adaptability
+
+**7. AESTHETIC QUALITY:**
+- Visual impact and character
+- Architectural style consistency
+- Detail quality and craftsmanship
+- Overall design coherence
+
+**8. SUSTAINABILITY:**
+- Energy efficiency considerations
+- Sustainable material usage
+- Environmental impact minimization
+- Long-term sustainability features
+
+**ARCHITECTURAL RECOMMENDATIONS:**
+- Specific design improvements
+- Structural optimization suggestions
+- Material and finish enhancements
+- Functional layout improvements
+- Sustainability enhancement opportunities"""
+
+# Report templates for the image analysis tools
+_DESIGN_REPORT = """
+🎨 **GRAPHIC DESIGN ANALYSIS REPORT**
+
+📋 **ANALYSIS RESULTS:**
+{analysis}
+
+🔗 **ANALYZED IMAGE:** {url}
+
+---
+*✨ Analysis powered by OpenAI GPT-4 Vision*"""
+
+_COPY_REPORT = """
 ✍️ **COPYWRITING ANALYSIS REPORT**
 
 📝 **ANALYSIS RESULTS:**
@@ -221,8 +863,100 @@ If no text is visible, indicate that no copywriting was found to analyze."""
 
 ---
 *✨ Analysis powered by OpenAI GPT-4 Vision*"""
+
+_LAYOUT_REPORT = """
+📐 **LAYOUT & ALIGNMENT ANALYSIS REPORT**
+
+📊 **LAYOUT ANALYSIS:**
+{analysis}
+
+🔗 **ANALYZED IMAGE:** {url}
+
+---
+*✨ Analysis powered by OpenAI GPT-4o Vision - Layout Specialist*"""
+
+_ARCHITECTURE_REPORT = """
+🏗️ **ARCHITECTURAL DESIGN ANALYSIS REPORT**
+
+🏢 **ANALYSIS RESULTS:**
+{analysis}
+
+🔗 **ANALYZED IMAGE:** {url}
+
+---
+*✨ Analysis powered by OpenAI GPT-4o Vision - Architectural Specialist*"""
+
+# Image analysis jobs, one per tool; analyze_all runs several over one image
+_DESIGN_JOB = _ImageJob(_DESIGN_PROMPT, 1200, 0.7, _DESIGN_REPORT)
+_COPY_JOB = _ImageJob(_COPY_PROMPT, 1500, 0.8, _COPY_REPORT)
+_LAYOUT_JOB = _ImageJob(_LAYOUT_PROMPT, 1800, 0.7, _LAYOUT_REPORT)
+_ARCHITECTURE_JOB = _ImageJob(_ARCHITECTURE_PROMPT, 2000, 0.7, _ARCHITECTURE_REPORT)
+
+# Aspects analyze_all can run, by name
+_ASPECT_JOBS = {
+    "design": _DESIGN_JOB,
+    "copywriting": _COPY_JOB,
+    "layout": _LAYOUT_JOB,
+    "architecture": _ARCHITECTURE_JOB,
+}
+_DEFAULT_ASPECTS = ("design", "copywriting", "layout")
+
+# In-flight analyses by (url, jobs), so identical concurrent calls share one request
+_inflight_analyses: Dict[Tuple[str, Tuple[_ImageJob, ...]],
+                         Tuple["asyncio.Future[Optional[List[str]]]", _TokenProgress]] = {}
+
+async def _analyze_image_shared(client: AsyncOpenAI, url: str, jobs: Sequence[_ImageJob],
+                                ctx: Optional[Context] = None) -> Optional[List[str]]:
+    """
+    Run _analyze_image, joining an identical analysis that is already in flight.
+    
+    Clients often re-issue a tool call before the first one finishes; the cache
+    only helps once a result exists, so without this both calls would pay for the
+    probe, download and completions. Each waiting caller's ctx receives progress
+    while it waits. The shared task is shielded so a cancelled caller does not
+    cancel it for others.
+    """
+    key = (url, tuple(jobs))
+    inflight = _inflight_analyses.get(key)
+    if inflight is None:
+        progress = _TokenProgress(None, sum(job.max_tokens for job in jobs))
+        task = asyncio.ensure_future(_analyze_image(client, url, jobs, progress))
+        _inflight_analyses[key] = (task, progress)
+        task.add_done_callback(lambda _: _inflight_analyses.pop(key, None))
+    else:
+        task, progress = inflight
+    
+    if ctx is not None:
+        progress.ctxs.append(ctx)
+    try:
+        return await asyncio.shield(task)
+    finally:
+        if ctx in progress.ctxs:
+            progress.ctxs.remove(ctx)
+
+async def _run_image_tool(url: str, jobs: Sequence[_ImageJob], ctx: Optional[Context] = None) -> str:
+    """
+    Shared body of the image analysis tools.
+    
+    Validates the URL, analyzes the image once per job and fills each job's
+    report template, returning errors as formatted messages.
+    """
+    try:
+        # Validate and clean URL
+        url, error = _validate_url(url)
+        if error:
+            return error
         
-        return formatted_response
+        # Get shared OpenAI client
+        client = _get_client()
+        if client is None:
+            return _MISSING_KEY_ERROR
+        
+        analyses = await _analyze_image_shared(client, url, jobs, ctx)
+        if analyses is None:
+            return "❌ Error: The provided URL does not point to an image file"
+        
+        return "\n".join(job.report.format(analysis=analysis, url=url) for job, analysis in zip(jobs, analyses))
         
     except requests.exceptions.RequestException as e:
         return f"❌ **Network Error:** Could not download image from URL. {str(e)}"
@@ -230,43 +964,62 @@ If no text is visible, indicate that no copywriting was found to analyze."""
         return f"❌ **Error:** {str(e)}"
 
 @mcp.tool()
-def analyze_website_design(url: str) -> str:
+async def analyze_design(url: str, ctx: Context) -> str:
     """
-    Analyze website design by taking a screenshot and evaluating the overall web design.
+    Analyze graphic design and provide detailed feedback on visual elements.
     
-    This tool analyzes website design elements including layout, navigation, visual hierarchy,
-    responsive design, user experience, and overall aesthetic appeal.
+    This tool downloads an image from the provided URL and analyzes it using OpenAI's vision model.
+    It provides scores and feedback on Visual Harmony, Clarity, User Friendliness, Interactivity, and Creativity.
     
     Args:
-        url: The website URL to analyze (must be a valid HTTP/HTTPS URL)
+        url: The URL of the image to analyze (must be a valid HTTP/HTTPS URL)
         
     Returns:
-        A detailed analysis of the website design with scores and recommendations
+        A detailed analysis of the graphic design with scores and recommendations
     """
-    try:
-        # Validate URL
-        if not url or not url.strip():
-            return "❌ Error: URL cannot be empty"
-        
-        url = url.strip()
-        
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        # Get OpenAI API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return "❌ Error: OPENAI_API_KEY environment variable not found. Please set your OpenAI API key."
+    return await _run_image_tool(url, (_DESIGN_JOB,), ctx)
+
+@mcp.tool()
+async def analyze_copywriting(url: str, ctx: Context) -> str:
+    """
+    Analyze copywriting in images and provide scoring with alternative suggestions.
+    
+    This tool downloads an image from the provided URL and analyzes any text/copywriting present.
+    It provides scores on effectiveness, clarity, persuasiveness, and offers alternative copywriting suggestions.
+    
+    Args:
+        url: The URL of the image to analyze (must be a valid HTTP/HTTPS URL)
         
-        # For now, we'll provide analysis based on the URL and general web design principles
-        client = OpenAI(api_key=api_key)
+    Returns:
+        A detailed analysis of the copywriting with scores and alternative suggestions
+    """
+    return await _run_image_tool(url, (_COPY_JOB,), ctx)
+
+@mcp.tool()
+async def analyze_all(url: str, ctx: Context, aspects: Optional[List[str]] = None) -> str:
+    """
+    Analyze several aspects of an image in one call (by default design, copywriting and layout).
+    
+    Equivalent to running analyze_design, analyze_copywriting, analyze_layout_alignment and/or
+    analyze_architectural_design on the same URL, but the image is probed, downloaded and
+    encoded once and the analyses run concurrently.
+    
+    Args:
+        url: The URL of the image to analyze (must be a valid HTTP/HTTPS URL)
+        aspects: Analyses to run, any of "design", "copywriting", "layout", "architecture"
+            (default: design, copywriting and layout)
         
-        result = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user", 
-                    "content": f"""Analyze the website design at: {url}
+    Returns:
+        One analysis report per requested aspect, in the order given
+    """
+    names = list(dict.fromkeys(aspects or _DEFAULT_ASPECTS))
+    unknown = [name for name in names if name not in _ASPECT_JOBS]
+    if unknown:
+        return f"❌ Error: Unknown aspect(s): {', '.join(unknown)}. Choose from: {', '.join(_ASPECT_JOBS)}"
+    return await _run_image_tool(url, tuple(_ASPECT_JOBS[name] for name in names), ctx)
+
+# Prompt and report for website analysis from a rendered screenshot
+_WEBSITE_SCREENSHOT_PROMPT = """Analyze the design of this website screenshot, taken from: {url}
 
 Please provide a comprehensive website design analysis with scores (1-10) for:
 
@@ -291,27 +1044,9 @@ Please provide a comprehensive website design analysis with scores (1-10) for:
 - Specific improvements for layout
 - Navigation enhancements
 - Visual design suggestions
-- Technical optimization tips
+- Technical optimization tips"""
 
-Note: This analysis is based on general web design principles. For more accurate results, please use a screenshot service to capture the website and analyze it using the `analyze_design` tool.
-
-📸 **For detailed visual analysis:**
-1. Take a screenshot of the website
-2. Upload it to an image hosting service
-3. Use `analyze_design` with the image URL
-
----
-*✨ Analysis powered by OpenAI GPT-4o & Web Design Principles*"""
-                }
-            ],
-            max_tokens=1500,
-            temperature=0.7
-        )
-        
-        analysis = result.choices[0].message.content
-        
-        # Format the response
-        formatted_response = f"""
+_WEBSITE_SCREENSHOT_REPORT = """
 🌐 **WEBSITE DESIGN ANALYSIS REPORT**
 
 🔗 **ANALYZED WEBSITE:** {url}
@@ -319,155 +1054,184 @@ Note: This analysis is based on general web design principles. For more accurate
 📊 **ANALYSIS RESULTS:**
 {analysis}
 
-💡 **NOTE:** This analysis is based on web design best practices. For more accurate results, please use a screenshot service to capture the website and analyze it using the `analyze_design` tool.
-
-📸 **For detailed visual analysis:**
-1. Take a screenshot of the website
-2. Upload it to an image hosting service
-3. Use `analyze_design` with the image URL
-
 ---
-*✨ Analysis powered by OpenAI GPT-4o & Web Design Principles*"""
-        
-        return formatted_response
-        
-    except Exception as e:
-        return f"❌ **Error:** {str(e)}"
+*✨ Analysis powered by OpenAI GPT-4o Vision*"""
 
 @mcp.tool()
-def analyze_layout_alignment(url: str) -> str:
+async def analyze_website_design(url: str, ctx: Context) -> str:
     """
-    Analyze layout alignment, spacing, and symmetry issues in design images.
+    Analyze website design by taking a screenshot and evaluating the overall web design.
     
-    This tool focuses specifically on layout problems including misalignment, inconsistent spacing,
-    asymmetric elements, and provides detailed suggestions for improvement.
+    This tool analyzes website design elements including layout, navigation, visual hierarchy,
+    responsive design, user experience, and overall aesthetic appeal.
     
     Args:
-        url: The URL of the design image to analyze for layout issues
+        url: The website URL to analyze (must be a valid HTTP/HTTPS URL)
         
     Returns:
-        A detailed analysis of layout, alignment, and spacing issues with specific recommendations
+        A detailed analysis of the website design with scores and recommendations
     """
     try:
-        # Validate and clean URL
-        if not url or not url.strip():
+        # Validate URL
+        url = _clean_url(url)
+        if not url:
             return "❌ Error: URL cannot be empty"
         
-        url = url.strip().lstrip('@')
-        
-        if not url.startswith(('http://', 'https://')):
-            return "❌ Error: Please provide a valid HTTP/HTTPS URL"
-        
-        # Get OpenAI API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return "❌ Error: OPENAI_API_KEY environment variable not found. Please set your OpenAI API key."
-        
-        # Download image with proper headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Check if the content is an image
-        content_type = response.headers.get('content-type', '')
-        if not content_type.startswith('image/'):
-            return "❌ Error: The provided URL does not point to an image file"
-        
-        # Encode image to base64
-        image_data = base64.b64encode(response.content).decode()
-        
-        # Create OpenAI client and analyze
-        client = OpenAI(api_key=api_key)
+        if not url.startswith(_URL_SCHEMES):
+            url = 'https://' + url
         
-        result = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user", 
-                    "content": [
-                        {
-                            "type": "text", 
-                            "text": """Analyze this design with a focus on layout, alignment, and spacing issues. Provide detailed feedback on:
-
-**LAYOUT ANALYSIS SCORES** (format: "Category: X/10"):
-1. Overall Alignment: X/10
-2. Spacing Consistency: X/10
-3. Grid System Usage: X/10
-4. Element Balance: X/10
-5. Visual Weight Distribution: X/10
+        # Get shared OpenAI client
+        client = _get_client()
+        if client is None:
+            return _MISSING_KEY_ERROR
+        
+        # The answer is streamed; progress is reported against its token budget
+        progress = _TokenProgress(ctx, 1500)
+        
+        # Review a rendered screenshot when Playwright is installed
+        screenshot = await _screenshot_website(url)
+        if screenshot is not None:
+            loop = asyncio.get_running_loop()
+            image_url = await loop.run_in_executor(None, _to_data_url, 'image/jpeg', screenshot)
+            content = [
+                {"type": "text", "text": _WEBSITE_SCREENSHOT_PROMPT.format(url=url)},
+                {"type": "image_url", "image_url": {"url": image_url}}
+            ]
+            analysis = await _stream_completion(client, content, 1500, 0.7, progress)
+            return _WEBSITE_SCREENSHOT_REPORT.format(analysis=analysis, url=url)
+        
+        # Otherwise, provide analysis based on the URL and general web design principles
+        prompt = f"""Analyze the website design at: {url}
 
-**DETAILED LAYOUT ASSESSMENT:**
+Please provide a comprehensive website design analysis with scores (1-10) for:
 
-**1. ALIGNMENT ISSUES:**
-- Identify misaligned elements (text, images, buttons, etc.)
-- Check for consistent margins and padding
-- Evaluate baseline grid alignment
-- Note any elements that break the layout structure
+**WEBSITE DESIGN SCORES:**
+1. Layout & Structure: X/10
+2. Navigation & UX: X/10
+3. Visual Hierarchy: X/10
+4. Color Scheme & Branding: X/10
+5. Typography: X/10
+6. Responsiveness: X/10
+7. Loading Speed: X/10
+8. Accessibility: X/10
 
-**2. SPACING PROBLEMS:**
-- Analyze white space usage and distribution
-- Check for inconsistent gaps between elements
-- Identify cramped or overly spaced areas
-- Evaluate breathing room around key elements
+**DETAILED ANALYSIS:**
+- Overall design assessment
+- Strengths and weaknesses
+- User experience evaluation
+- Mobile responsiveness considerations
+- Performance and accessibility notes
 
-**3. SYMMETRY & ASYMMETRY:**
-- Identify intentional vs unintentional asymmetric elements
-- Check for visual balance issues
-- Note elements that appear "off-center" when they shouldn't be
-- Evaluate compositional balance
+**RECOMMENDATIONS:**
+- Specific improvements for layout
+- Navigation enhancements
+- Visual design suggestions
+- Technical optimization tips
 
-**4. GRID & STRUCTURE:**
-- Assess adherence to grid system
-- Identify elements that break the grid unnecessarily
-- Check for consistent column widths and gutters
-- Evaluate overall structural hierarchy
+Note: This analysis is based on general web design principles. For more accurate results, please use a screenshot service to capture the website and analyze it using the `analyze_design` tool.
 
-**5. SPECIFIC RECOMMENDATIONS:**
-- Provide exact pixel/spacing adjustments where possible
-- Suggest alignment fixes for specific elements
-- Recommend spacing improvements
-- Propose solutions for asymmetry issues
-- Give actionable layout optimization tips
+📸 **For detailed visual analysis:**
+1. Take a screenshot of the website
+2. Upload it to an image hosting service
+3. Use `analyze_design` with the image URL
 
-Be very specific about what needs to be fixed and how to fix it."""
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
-                        }
-                    ]
-                }
-            ],
-            max_tokens=1800,
-            temperature=0.7
-        )
-        
-        analysis = result.choices[0].message.content
+---
+*✨ Analysis powered by OpenAI GPT-4o & Web Design Principles*"""
+        analysis = await _stream_completion(client, prompt, 1500, 0.7, progress)
         
-        # Format the response with emojis and better structure
+        # Format the response
         formatted_response = f"""
-📐 **LAYOUT & ALIGNMENT ANALYSIS REPORT**
+🌐 **WEBSITE DESIGN ANALYSIS REPORT**
 
-📊 **LAYOUT ANALYSIS:**
+🔗 **ANALYZED WEBSITE:** {url}
+
+📊 **ANALYSIS RESULTS:**
 {analysis}
 
-🔗 **ANALYZED IMAGE:** {url}
+💡 **NOTE:** This analysis is based on web design best practices. For more accurate results, please use a screenshot service to capture the website and analyze it using the `analyze_design` tool.
+
+📸 **For detailed visual analysis:**
+1. Take a screenshot of the website
+2. Upload it to an image hosting service
+3. Use `analyze_design` with the image URL
 
 ---
-*✨ Analysis powered by OpenAI GPT-4o Vision - Layout Specialist*"""
+*✨ Analysis powered by OpenAI GPT-4o & Web Design Principles*"""
         
         return formatted_response
         
-    except requests.exceptions.RequestException as e:
-        return f"❌ **Network Error:** Could not download image from URL. {str(e)}"
     except Exception as e:
         return f"❌ **Error:** {str(e)}"
 
 @mcp.tool()
-def analyze_pdf_presentation(url: str) -> str:
+async def analyze_layout_alignment(url: str, ctx: Context) -> str:
+    """
+    Analyze layout alignment, spacing, and symmetry issues in design images.
+    
+    This tool focuses specifically on layout problems including misalignment, inconsistent spacing,
+    asymmetric elements, and provides detailed suggestions for improvement.
+    
+    Args:
+        url: The URL of the design image to analyze for layout issues
+        
+    Returns:
+        A detailed analysis of layout, alignment, and spacing issues with specific recommendations
+    """
+    return await _run_image_tool(url, (_LAYOUT_JOB,), ctx)
+
+# Scoring and feedback instructions shared by the rendered and text-only PDF prompts
+_PDF_ANALYSIS_PROMPT = """Please provide a comprehensive presentation analysis with scores (1-10) for:
+
+**PRESENTATION DESIGN SCORES:**
+1. Visual Design & Layout: X/10
+2. Content Organization: X/10
+3. Typography & Readability: X/10
+4. Color Scheme & Consistency: X/10
+5. Information Hierarchy: X/10
+6. Slide Flow & Structure: X/10
+7. Visual Elements Usage: X/10
+8. Professional Appearance: X/10
+
+**DETAILED ANALYSIS:**
+
+**1. SLIDE DESIGN QUALITY:**
+- Layout consistency across slides
+- Visual balance and white space usage
+- Professional design standards
+- Brand consistency (if applicable)
+
+**2. CONTENT ORGANIZATION:**
+- Logical flow of information
+- Clear section divisions
+- Effective use of headings and subheadings
+- Information density per slide
+
+**3. TYPOGRAPHY & READABILITY:**
+- Font selection and hierarchy
+- Text size and readability
+- Contrast and legibility
+- Consistent text formatting
+
+**4. VISUAL ELEMENTS:**
+- Use of images, charts, diagrams
+- Quality and relevance of visuals
+- Integration of multimedia elements
+- Visual-text balance
+
+**5. PRESENTATION FLOW:**
+- Introduction and conclusion effectiveness
+- Transition quality between topics
+- Logical progression of ideas
+- Call-to-action clarity
+
+**RECOMMENDATIONS:**
+- Specific improvements for slide design
+- Content organization suggestions
+- Visual enhancement recommendations
+- Professional presentation tips"""
+
+@mcp.tool()
+async def analyze_pdf_presentation(url: str, ctx: Context) -> str:
     """
     Analyze PDF presentation and provide detailed feedback on presentation design and content quality.
     
@@ -505,7 +1269,7 @@ def analyze_pdf_presentation(url: str) -> str:
             }
             # Human-like delay
             time.sleep(random.uniform(1.5, 3.0))
-            return requests.get(url, headers=headers, timeout=30), "Enhanced Headers"
+            return _STRATEGY_SESSION.get(url, headers=headers, timeout=30), "Enhanced Headers"
         
         # Strategy 2: Session-based request with referrer
         elif strategy_name == "session_based":
@@ -546,7 +1310,7 @@ def analyze_pdf_presentation(url: str) -> str:
                     'Upgrade-Insecure-Requests': '1'
                 }
                 time.sleep(random.uniform(2.0, 4.0))
-                return requests.get(https_url, headers=headers, timeout=30), "HTTPS Conversion"
+                return _STRATEGY_SESSION.get(https_url, headers=headers, timeout=30), "HTTPS Conversion"
         
         # Strategy 4: Mobile User Agent
         elif strategy_name == "mobile_agent":
@@ -558,7 +1322,7 @@ def analyze_pdf_presentation(url: str) -> str:
                 'Connection': 'keep-alive'
             }
             time.sleep(random.uniform(1.0, 2.0))
-            return requests.get(url, headers=headers, timeout=30), "Mobile Agent"
+            return _STRATEGY_SESSION.get(url, headers=headers, timeout=30), "Mobile Agent"
         
         # Strategy 5: Academic User Agent (for university sites)
         elif strategy_name == "academic_agent":
@@ -571,25 +1335,12 @@ def analyze_pdf_presentation(url: str) -> str:
                 'Referer': 'https://scholar.google.com/'
             }
             time.sleep(random.uniform(1.5, 2.5))
-            return requests.get(url, headers=headers, timeout=30), "Academic Agent"
+            return _STRATEGY_SESSION.get(url, headers=headers, timeout=30), "Academic Agent"
         
         return None, "Unknown Strategy"
     
-    try:
-        # Validate and clean URL
-        if not url or not url.strip():
-            return "❌ Error: URL cannot be empty"
-        
-        url = url.strip().lstrip('@')
-        
-        if not url.startswith(('http://', 'https://')):
-            return "❌ Error: Please provide a valid HTTP/HTTPS URL"
-        
-        # Get OpenAI API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return "❌ Error: OPENAI_API_KEY environment variable not found. Please set your OpenAI API key."
-        
+    def _fetch_pdf(url: str) -> tuple:
+        """Try each strategy, then a basic request; return (response, strategy name)"""
         # Multiple strategies to bypass bot detection
         strategies = [
             "enhanced_headers",
@@ -599,13 +1350,11 @@ def analyze_pdf_presentation(url: str) -> str:
             "mobile_agent"
         ]
         
-        response = None
-        used_strategy = "None"
-        
-        # Try each strategy until one works
+        # Try each strategy until one works; progress goes to stderr because
+        # stdout carries the MCP protocol
         for strategy in strategies:
             try:
-                print(f"🔄 Trying strategy: {strategy}")
+                print(f"🔄 Trying strategy: {strategy}", file=sys.stderr)
                 result = _try_enhanced_request(url, strategy)
                 if result[0] is not None:
                     test_response = result[0]
@@ -613,27 +1362,36 @@ def analyze_pdf_presentation(url: str) -> str:
                     
                     # Additional validation for successful response
                     if test_response.status_code == 200 and len(test_response.content) > 1000:
-                        response = test_response
-                        used_strategy = result[1]
-                        print(f"✅ Success with strategy: {used_strategy}")
-                        break
+                        print(f"✅ Success with strategy: {result[1]}", file=sys.stderr)
+                        return test_response, result[1]
                         
             except Exception as e:
-                print(f"❌ Strategy {strategy} failed: {str(e)}")
+                print(f"❌ Strategy {strategy} failed: {str(e)}", file=sys.stderr)
                 continue
         
         # If all strategies failed, try basic request as final fallback
-        if response is None:
-            try:
-                print("🔄 Trying basic fallback request...")
-                basic_headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                response = requests.get(url, headers=basic_headers, timeout=30)
-                response.raise_for_status()
-                used_strategy = "Basic Fallback"
-            except Exception as e:
-                return f"❌ **All Access Strategies Failed:** Could not download PDF from URL after trying multiple bot detection bypass methods.\n\n🔍 **Attempted Strategies:**\n• Enhanced Headers\n• Session-Based Request\n• HTTPS Conversion\n• Academic User Agent\n• Mobile User Agent\n• Basic Fallback\n\n**Final Error:** {str(e)}\n\n💡 **Suggestion:** The website may have advanced bot protection. Try:\n1. Accessing the URL manually in a browser\n2. Using a different PDF hosting service\n3. Converting the PDF to images and using image analysis tools"
+        print("🔄 Trying basic fallback request...", file=sys.stderr)
+        response = _SESSION.get(url, timeout=30)
+        response.raise_for_status()
+        return response, "Basic Fallback"
+    
+    try:
+        # Validate and clean URL
+        url, error = _validate_url(url)
+        if error:
+            return error
+        
+        # Get shared OpenAI client
+        client = _get_client()
+        if client is None:
+            return _MISSING_KEY_ERROR
+        
+        # Download off the event loop; the strategies block on requests and delays
+        loop = asyncio.get_running_loop()
+        try:
+            response, used_strategy = await loop.run_in_executor(None, _fetch_pdf, url)
+        except Exception as e:
+            return f"❌ **All Access Strategies Failed:** Could not download PDF from URL after trying multiple bot detection bypass methods.\n\n🔍 **Attempted Strategies:**\n• Enhanced Headers\n• Session-Based Request\n• HTTPS Conversion\n• Academic User Agent\n• Mobile User Agent\n• Basic Fallback\n\n**Final Error:** {str(e)}\n\n💡 **Suggestion:** The website may have advanced bot protection. Try:\n1. Accessing the URL manually in a browser\n2. Using a different PDF hosting service\n3. Converting the PDF to images and using image analysis tools"
         
         # Check if the content is a PDF
         content_type = response.headers.get('content-type', '')
@@ -647,76 +1405,58 @@ def analyze_pdf_presentation(url: str) -> str:
         # Success message with strategy info
         strategy_info = f"\n🛡️ **Bot Detection Bypass:** Successfully accessed using {used_strategy} strategy"
         
-        # For PDF analysis, we'll provide comprehensive analysis based on presentation design principles
-        client = OpenAI(api_key=api_key)
+        # Pick the pages GPT-4o reviews from the page count alone, so a cached
+        # analysis is returned without rendering or base64-encoding any page.
+        # The PDF bytes are part of each key, so a changed file at the same URL is re-analyzed
+        total_pages = await loop.run_in_executor(None, _count_pdf_pages, response.content)
+        page_indexes = _sample_pdf_pages(total_pages)
+        if page_indexes:
+            shown = ", ".join(str(index + 1) for index in page_indexes)
+            prompt = (f"Analyze this PDF presentation from: {url}\n"
+                      f"It has {total_pages} pages; pages {shown} are attached as images, in that order.\n\n"
+                      f"{_PDF_ANALYSIS_PROMPT}")
+            cache_key = _cache_key(prompt, response.content)
+            analysis = await _get_cached_analysis(cache_key)
+            if analysis is None:
+                # Render the pages so GPT-4o reviews the actual slides
+                page_urls = await loop.run_in_executor(None, _render_pdf_pages, response.content, page_indexes)
+                if page_urls is None:
+                    page_indexes = []
+                else:
+                    content = [{"type": "text", "text": prompt}] + [
+                        {"type": "image_url", "image_url": {"url": page_url}} for page_url in page_urls
+                    ]
+                    analysis = await _stream_completion(client, content, 1500, 0.7, _TokenProgress(ctx, 1500))
+                    await _cache_analysis(cache_key, analysis)
         
-        result = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user", 
-                    "content": f"""Analyze the PDF presentation from this URL: {url}
-
-Please provide a comprehensive presentation analysis with scores (1-10) for:
+        if not page_indexes:
+            # Without PyMuPDF, provide analysis based on presentation design principles
+            prompt = f"""Analyze the PDF presentation from this URL: {url}
 
-**PRESENTATION DESIGN SCORES:**
-1. Visual Design & Layout: X/10
-2. Content Organization: X/10
-3. Typography & Readability: X/10
-4. Color Scheme & Consistency: X/10
-5. Information Hierarchy: X/10
-6. Slide Flow & Structure: X/10
-7. Visual Elements Usage: X/10
-8. Professional Appearance: X/10
-
-**DETAILED ANALYSIS:**
-
-**1. SLIDE DESIGN QUALITY:**
-- Layout consistency across slides
-- Visual balance and white space usage
-- Professional design standards
-- Brand consistency (if applicable)
-
-**2. CONTENT ORGANIZATION:**
-- Logical flow of information
-- Clear section divisions
-- Effective use of headings and subheadings
-- Information density per slide
-
-**3. TYPOGRAPHY & READABILITY:**
-- Font selection and hierarchy
-- Text size and readability
-- Contrast and legibility
-- Consistent text formatting
+{_PDF_ANALYSIS_PROMPT}
 
-**4. VISUAL ELEMENTS:**
-- Use of images, charts, diagrams
-- Quality and relevance of visuals
-- Integration of multimedia elements
-- Visual-text balance
+Note: This analysis is based on presentation design best practices. For detailed visual analysis, please convert PDF pages to images and use the image analysis tools."""
+            cache_key = _cache_key(prompt, response.content)
+            analysis = await _get_cached_analysis(cache_key)
+            if analysis is None:
+                analysis = await _stream_completion(client, prompt, 1500, 0.7, _TokenProgress(ctx, 1500))
+                await _cache_analysis(cache_key, analysis)
+        
+        # Format the response with emojis and better structure
+        if page_indexes:
+            return f"""
+📊 **PDF PRESENTATION ANALYSIS REPORT**
 
-**5. PRESENTATION FLOW:**
-- Introduction and conclusion effectiveness
-- Transition quality between topics
-- Logical progression of ideas
-- Call-to-action clarity
+🔗 **ANALYZED PDF:** {url}
+{strategy_info}
+📄 **Pages Reviewed:** {shown} (of {total_pages})
 
-**RECOMMENDATIONS:**
-- Specific improvements for slide design
-- Content organization suggestions
-- Visual enhancement recommendations
-- Professional presentation tips
+📋 **ANALYSIS RESULTS:**
+{analysis}
 
-Note: This analysis is based on presentation design best practices. For detailed visual analysis, please convert PDF pages to images and use the image analysis tools."""
-                }
-            ],
-            max_tokens=1500,
-            temperature=0.7
-        )
-        
-        analysis = result.choices[0].message.content
+---
+*✨ Analysis powered by OpenAI GPT-4o Vision & Advanced Bot Detection Bypass Technology*"""
         
-        # Format the response with emojis and better structure
         formatted_response = f"""
 📊 **PDF PRESENTATION ANALYSIS REPORT**
 
@@ -744,7 +1484,7 @@ Note: This analysis is based on presentation design best practices. For detailed
         return f"❌ **Error:** {str(e)}"
 
 @mcp.tool()
-def analyze_architectural_design(url: str) -> str:
+async def analyze_architectural_design(url: str, ctx: Context) -> str:
     """
     Analyze architectural design and provide detailed feedback on architectural elements.
     
@@ -757,151 +1497,14 @@ def analyze_architectural_design(url: str) -> str:
     Returns:
         A detailed analysis of the architectural design with scores and recommendations
     """
-    try:
-        # Validate and clean URL
-        if not url or not url.strip():
-            return "❌ Error: URL cannot be empty"
-        
-        url = url.strip().lstrip('@')
-        
-        if not url.startswith(('http://', 'https://')):
-            return "❌ Error: Please provide a valid HTTP/HTTPS URL"
-        
-        # Get OpenAI API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return "❌ Error: OPENAI_API_KEY environment variable not found. Please set your OpenAI API key."
-        
-        # Download image with proper headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # Check if the content is an image
-        content_type = response.headers.get('content-type', '')
-        if not content_type.startswith('image/'):
-            return "❌ Error: The provided URL does not point to an image file"
-        
-        # Encode image to base64
-        image_data = base64.b64encode(response.content).decode()
-        
-        # Create OpenAI client and analyze
-        client = OpenAI(api_key=api_key)
-        
-        result = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user", 
-                    "content": [
-                        {
-                            "type": "text", 
-                            "text": """Analyze this architectural design in detail. Focus specifically on architectural elements and provide numerical scores (1-10) for each category, then detailed feedback:
-
-**ARCHITECTURAL DESIGN SCORES** (format: "Category: X/10"):
-1. Architectural Composition: X/10
-2. Spatial Design & Flow: X/10
-3. Structural Integrity & Innovation: X/10
-4. Material Selection & Usage: X/10
-5. Environmental Integration: X/10
-6. Functional Design: X/10
-7. Aesthetic Appeal: X/10
-8. Sustainability Considerations: X/10
-
-**DETAILED ARCHITECTURAL ANALYSIS:**
-
-**1. ARCHITECTURAL COMPOSITION:**
-- Proportion and scale relationships
-- Symmetry and balance in design
-- Visual weight distribution
-- Architectural harmony and unity
-
-**2. SPATIAL DESIGN & FLOW:**
-- Interior/exterior space organization
-- Traffic flow and circulation patterns
-- Space efficiency and functionality
-- Relationship between different areas
-
-**3. STRUCTURAL ELEMENTS:**
-- Structural system clarity and logic
-- Innovation in structural solutions
-- Integration of structure with design
-- Structural expression and aesthetics
-
-**4. MATERIAL ANALYSIS:**
-- Material selection appropriateness
-- Texture and color combinations
-- Material durability and maintenance
-- Cost-effectiveness of material choices
-
-**5. ENVIRONMENTAL INTEGRATION:**
-- Site integration and context response
-- Climate-responsive design features
-- Landscape integration
-- Natural light and ventilation utilization
-
-**6. FUNCTIONAL DESIGN:**
-- Program requirements fulfillment
-- User experience and comfort
-- Accessibility considerations
-- Flexibility and adaptability
-
-**7. AESTHETIC QUALITY:**
-- Visual impact and character
-- Architectural style consistency
-- Detail quality and craftsmanship
-- Overall design coherence
-
-**8. SUSTAINABILITY:**
-- Energy efficiency considerations
-- Sustainable material usage
-- Environmental impact minimization
-- Long-term sustainability features
-
-**ARCHITECTURAL RECOMMENDATIONS:**
-- Specific design improvements
-- Structural optimization suggestions
-- Material and finish enhancements
-- Functional layout improvements
-- Sustainability enhancement opportunities"""
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
-                        }
-                    ]
-                }
-            ],
-            max_tokens=2000,
-            temperature=0.7
-        )
-        
-        analysis = result.choices[0].message.content
-        
-        # Format the response with emojis and better structure
-        formatted_response = f"""
-🏗️ **ARCHITECTURAL DESIGN ANALYSIS REPORT**
-
-🏢 **ANALYSIS RESULTS:**
-{analysis}
-
-🔗 **ANALYZED IMAGE:** {url}
-
----
-*✨ Analysis powered by OpenAI GPT-4o Vision - Architectural Specialist*"""
-        
-        return formatted_response
-        
-    except requests.exceptions.RequestException as e:
-        return f"❌ **Network Error:** Could not download image from URL. {str(e)}"
-    except Exception as e:
-        return f"❌ **Error:** {str(e)}"
+    return await _run_image_tool(url, (_ARCHITECTURE_JOB,), ctx)
 
 def main():
     """Main entry point for the MCP server"""
+    # Flag a missing key at startup; stdout carries the MCP protocol, so use stderr
+    if not _API_KEY:
+        print("⚠️ OPENAI_API_KEY is not set; analysis tools will return an error until it is configured.",
+              file=sys.stderr)
     mcp.run()
 
 if __name__ == "__main__":